@@ -0,0 +1,180 @@
+"""
+Benchmark of sharded ingestion and routed fan-out retrieval over synthetic corpora of increasing size.
+
+Each synthetic document is a set of chunk embeddings drawn around its own topic vector. Topics
+are mixtures of a small number of shared themes, so documents overlap and the router can pick
+the wrong shard. The in-memory store stands in for a Pinecone namespace. The single-index
+baseline ingests documents sequentially and scans every chunk per query, which is how the
+pipeline behaved before sharding.
+
+The incremental case then adds ADDED_DOCUMENTS new documents to the existing corpus. Like
+process_directory(), it fingerprints every document, keeps the shards the manifest reports as
+current, and ingests only the new ones, so its cost follows the size of the change (plus a
+cheap hash per document) rather than the size of the corpus.
+
+Only the upsert network I/O of ingestion is modeled, as UPSERT_LATENCY per upsert batch, so the
+ingestion speedup reported here comes from overlapping that I/O across threads. PDF parsing
+and local embedding, which dominate DataProcessor._process_shard in practice, are not part of
+the benchmark. Threads do not speed up PDF parsing because of the GIL, so the ingestion
+numbers are an upper bound for process_directory(). The query numbers measure routing and
+fan-out search only, without query embedding or network latency.
+
+Usage:
+    python benchmark_sharding.py
+"""
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.config import PINECONE_DIMENSIONS, ROUTER_TOP_SHARDS, MAX_PARALLEL_WORKERS, Top_K
+from src.sharding import ShardManifest, ShardRouter, compute_centroid, fan_out_search
+
+CORPUS_SIZES = [8, 32, 128, 512]
+CHUNKS_PER_DOCUMENT = 200
+UPSERT_BATCH_SIZE = 32
+UPSERT_LATENCY = 0.005  # Seconds per simulated upsert batch
+NUM_QUERIES = 50
+ADDED_DOCUMENTS = 8
+NUM_THEMES = 8
+THEME_WEIGHT = 0.8  # Share of each topic vector taken from a common theme
+
+
+class InMemoryShardStore:
+    """
+    Minimal namespaced vector store exposing the search method used by ShardedRetriever.
+    """
+
+    def __init__(self) -> None:
+        self.batches: dict[str, list[np.ndarray]] = {}
+        self.namespaces: dict[str, np.ndarray] = {}
+
+    def upsert(self, namespace: str, vectors: np.ndarray) -> None:
+        for _ in range(0, len(vectors), UPSERT_BATCH_SIZE):
+            time.sleep(UPSERT_LATENCY)
+        self.batches.setdefault(namespace, []).append(vectors)
+
+    def build(self) -> None:
+        for namespace, batches in self.batches.items():
+            self.namespaces[namespace] = np.vstack([self.namespaces[namespace], *batches]) \
+                if namespace in self.namespaces else np.vstack(batches)
+        self.batches = {}
+
+    def similarity_search_by_vector_with_score(self, embedding, k: int = Top_K, namespace: str = "default"):
+        scores = self.namespaces[namespace] @ embedding
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [((namespace, int(i)), float(scores[i])) for i in top]
+
+
+def make_corpus(num_documents: int, rng: np.random.Generator) -> tuple[np.ndarray, list[np.ndarray]]:
+    themes = rng.standard_normal((NUM_THEMES, PINECONE_DIMENSIONS)).astype(np.float32)
+    unique = rng.standard_normal((num_documents, PINECONE_DIMENSIONS)).astype(np.float32)
+    topics = THEME_WEIGHT * themes[rng.integers(0, NUM_THEMES, num_documents)] + (1 - THEME_WEIGHT) * unique
+    documents = []
+    for topic in topics:
+        chunks = topic + 0.8 * rng.standard_normal((CHUNKS_PER_DOCUMENT, PINECONE_DIMENSIONS)).astype(np.float32)
+        documents.append(chunks / np.linalg.norm(chunks, axis=1, keepdims=True))
+    return topics, documents
+
+
+def fingerprint(chunks: np.ndarray) -> dict[str, str]:
+    return {"document": hashlib.sha1(chunks.tobytes()).hexdigest()}
+
+
+def benchmark(num_documents: int, rng: np.random.Generator) -> dict:
+    topics, all_documents = make_corpus(num_documents + ADDED_DOCUMENTS, rng)
+    documents, added_documents = all_documents[:num_documents], all_documents[num_documents:]
+
+    # Baseline: a single index, documents ingested one after another.
+    baseline = InMemoryShardStore()
+    start = time.perf_counter()
+    for chunks in documents:
+        baseline.upsert("default", chunks)
+    baseline_ingest = time.perf_counter() - start
+    for chunks in added_documents:
+        baseline.upsert("default", chunks)
+    baseline.build()
+
+    # Sharded: one namespace per document, shards ingested concurrently.
+    sharded = InMemoryShardStore()
+    manifest = ShardManifest(path="")
+
+    def ingest(item):
+        namespace, chunks = item
+        sharded.upsert(namespace, chunks)
+        return namespace, compute_centroid(chunks)
+
+    def ingest_changed(corpus: list[np.ndarray]) -> None:
+        fingerprints = {f"doc-{i:04d}": fingerprint(chunks) for i, chunks in enumerate(corpus)}
+        items = [
+            (namespace, corpus[i]) for i, namespace in enumerate(fingerprints)
+            if not manifest.is_current(namespace, fingerprints[namespace])
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
+            for namespace, centroid in executor.map(ingest, items):
+                manifest.add_shard(namespace, fingerprints[namespace], centroid, CHUNKS_PER_DOCUMENT)
+        sharded.build()
+
+    start = time.perf_counter()
+    ingest_changed(documents)
+    sharded_ingest = time.perf_counter() - start
+
+    # Incremental: add new documents to the existing corpus; only they are ingested.
+    start = time.perf_counter()
+    ingest_changed(documents + added_documents)
+    incremental_ingest = time.perf_counter() - start
+    router = ShardRouter(manifest)
+
+    # Queries are perturbed topic vectors, so the relevant document is known.
+    targets = rng.integers(0, num_documents + ADDED_DOCUMENTS, NUM_QUERIES)
+    queries = topics[targets] + 0.8 * rng.standard_normal((NUM_QUERIES, PINECONE_DIMENSIONS)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    for query in queries:
+        baseline.similarity_search_by_vector_with_score(query, k=Top_K, namespace="default")
+    baseline_query = (time.perf_counter() - start) / NUM_QUERIES
+
+    routed_hits = 0
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as search_executor:
+        start = time.perf_counter()
+        for query, target in zip(queries, targets):
+            namespaces = router.route(query)
+            routed_hits += f"doc-{target:04d}" in namespaces
+            fan_out_search(
+                lambda namespace: sharded.similarity_search_by_vector_with_score(query, k=Top_K, namespace=namespace),
+                namespaces,
+                k=Top_K,
+                executor=search_executor,
+            )
+        sharded_query = (time.perf_counter() - start) / NUM_QUERIES
+
+    return {
+        "documents": num_documents,
+        "baseline_ingest_s": baseline_ingest,
+        "sharded_ingest_s": sharded_ingest,
+        "incremental_ingest_s": incremental_ingest,
+        "baseline_query_ms": baseline_query * 1000,
+        "sharded_query_ms": sharded_query * 1000,
+        "router_recall": routed_hits / NUM_QUERIES,
+    }
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{CHUNKS_PER_DOCUMENT} chunks/document, top {ROUTER_TOP_SHARDS} shards/query, "
+          f"{MAX_PARALLEL_WORKERS} workers, {UPSERT_LATENCY * 1000:.0f} ms/upsert batch (upsert I/O only)")
+    header = f"{'docs':>6} {'ingest base (s)':>16} {'ingest shard (s)':>17} {f'add {ADDED_DOCUMENTS} docs (s)':>16} " \
+             f"{'query base (ms)':>16} {'query shard (ms)':>17} {'router recall':>14}"
+    print(header)
+    for num_documents in CORPUS_SIZES:
+        result = benchmark(num_documents, rng)
+        print(f"{result['documents']:>6} {result['baseline_ingest_s']:>16.3f} {result['sharded_ingest_s']:>17.3f} "
+              f"{result['incremental_ingest_s']:>16.3f} "
+              f"{result['baseline_query_ms']:>16.3f} {result['sharded_query_ms']:>17.3f} "
+              f"{result['router_recall']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ async def initialize_app():
         # Uncomment the following lines if data reprocessing is needed.
         # logger.info("Processing PDF data to update vector store.")
         # processor = DataProcessor()
-        # processor.process_data()
+        # processor.process_directory()
 
         # Step 2: Load the pre-built vector store from disk.
         logger.info("Loading the vector store from disk.")
@@ -9,7 +9,9 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 # Paths for data resources.
 PDF_PATH = os.path.join(BASE_DIR, "data", "national-cancer-plan-508.pdf")
+PDF_DIRECTORY = os.path.join(BASE_DIR, "data")  # Every *.pdf in here is ingested by DataProcessor.process_directory()
 VECTORSTORE_SAVE_DIRECTORY = os.path.join(BASE_DIR, "data")
+SHARD_MANIFEST_PATH = os.path.join(VECTORSTORE_SAVE_DIRECTORY, "shard_manifest.json")
 
 # Model configuration constants. If you change this you have to change the dimension size at PINECONE_DIMENSIONS as per the model 
 EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
@@ -29,4 +31,9 @@ PINECONE_DIMENSIONS = 384  # Dimensions for the embedding model (all-MiniLM-L6-v
 PINECONE_SEARCH_TYPE = "similarity"  # Use cosine similarity
 PINECONE_DISTANCE_METRICS = "cosine"
 
-Top_K = 4
\ No newline at end of file
+Top_K = 4
+
+# Sharding configuration. Each shard is stored in its own Pinecone namespace.
+SHARD_BY_SUBDIRECTORY = True  # PDFs under the same subdirectory of PDF_DIRECTORY share one shard; top-level PDFs get their own
+ROUTER_TOP_SHARDS = 3  # Number of shards queried per user question
+MAX_PARALLEL_WORKERS = 8  # Thread pool size for shard ingestion and query fan-out
@@ -1,5 +1,8 @@
+import os
 import re
 import copy
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_community.document_loaders import PDFPlumberLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -8,6 +11,7 @@ from langchain_pinecone import PineconeVectorStore
 from langchain_huggingface import HuggingFaceEmbeddings
 
 from src.config import *
+from src.sharding import ShardManifest, group_into_shards, compute_centroid, file_fingerprint
 from src import logger
 
 from pinecone import Pinecone, ServerlessSpec
@@ -61,6 +65,38 @@ class PDFDocumentHandler:
         return self.documents
 
 
+class PDFDirectoryHandler:
+    """
+    Discovers the PDF files of a corpus directory.
+    """
+
+    def __init__(self, directory: str = PDF_DIRECTORY) -> None:
+        """
+        Initialize with the directory holding the PDF files.
+
+        Args:
+            directory (str): Path to the corpus directory.
+        """
+        self.directory = directory
+
+    def list_pdf_files(self) -> list[str]:
+        """
+        Return the paths of all PDF files in the directory and its subdirectories.
+
+        Returns:
+            list[str]: Sorted PDF file paths.
+        """
+        try:
+            pdf_paths = []
+            for root, _, files in os.walk(self.directory):
+                pdf_paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+            logger.info("Found %d PDF files in %s.", len(pdf_paths), self.directory)
+            return sorted(pdf_paths)
+        except Exception:
+            logger.exception("Failed to list PDF files.")
+            raise
+
+
 class TextPreprocessor:
     """
     Cleans text extracted from documents by removing unwanted artifacts such as page numbers, headers, and extra whitespace.
@@ -170,6 +206,7 @@ class VectorStoreCreator:
         self.embedding_model = HuggingFaceEmbeddings(model_name=self.model_name)
         self.pinecone_client = Pinecone(api_key=PINECONE_API_KEY)
         self._ensure_index_exists()
+        self.index = self.pinecone_client.Index(self.index_name)
 
     def _ensure_index_exists(self) -> None:
         """
@@ -209,6 +246,117 @@ class VectorStoreCreator:
             logger.exception("Failed to create vector store.")
             raise
 
+    def clear_namespace(self, namespace: str) -> None:
+        """
+        Delete every vector stored in a Pinecone namespace, if the namespace exists.
+
+        Args:
+            namespace (str): The namespace to clear.
+        """
+        try:
+            if namespace in self.index.describe_index_stats().namespaces:
+                self.index.delete(delete_all=True, namespace=namespace)
+                logger.info("Cleared namespace '%s'.", namespace)
+        except Exception:
+            logger.exception("Failed to clear namespace '%s'.", namespace)
+            raise
+
+    def list_vector_ids(self, namespace: str) -> set[str]:
+        """
+        Return the IDs of all vectors currently stored in a Pinecone namespace.
+
+        Args:
+            namespace (str): The namespace to list.
+
+        Returns:
+            set[str]: Stored vector IDs (empty if the namespace does not exist).
+        """
+        try:
+            return {vector_id for page in self.index.list(namespace=namespace) for vector_id in page}
+        except Exception:
+            logger.exception("Failed to list vectors of namespace '%s'.", namespace)
+            raise
+
+    def delete_vectors(self, ids: list[str], namespace: str, batch_size: int = 1000) -> None:
+        """
+        Delete the given vectors from a Pinecone namespace.
+
+        Args:
+            ids (list[str]): IDs of the vectors to delete.
+            namespace (str): The namespace holding the vectors.
+            batch_size (int): Number of IDs per delete request.
+        """
+        try:
+            for start in range(0, len(ids), batch_size):
+                self.index.delete(ids=ids[start:start + batch_size], namespace=namespace)
+            logger.info("Deleted %d vectors from namespace '%s'.", len(ids), namespace)
+        except Exception:
+            logger.exception("Failed to delete vectors from namespace '%s'.", namespace)
+            raise
+
+    def embed_chunks(self, chunks: list) -> list[list[float]]:
+        """
+        Embed the text of the given chunks.
+
+        Args:
+            chunks (list): Document chunks to embed.
+
+        Returns:
+            list[list[float]]: One embedding per chunk.
+        """
+        try:
+            return self.embedding_model.embed_documents([chunk.page_content for chunk in chunks])
+        except Exception:
+            logger.exception("Failed to embed chunks.")
+            raise
+
+    def upsert_shard(
+        self,
+        chunks: list,
+        embeddings: list[list[float]],
+        ids: list[str],
+        namespace: str,
+        batch_size: int = 100,
+        text_key: str = "text"
+    ) -> None:
+        """
+        Upsert pre-computed chunk embeddings into a shard's namespace under the given IDs.
+        Vectors are stored in the same layout as PineconeVectorStore, so the namespace can be
+        searched through it.
+
+        Args:
+            chunks (list): Chunks stored in the shard.
+            embeddings (list[list[float]]): Embeddings of the chunks, in the same order.
+            ids (list[str]): Deterministic vector IDs, one per chunk.
+            namespace (str): Pinecone namespace of the shard.
+            batch_size (int): Number of vectors per upsert request.
+            text_key (str): Metadata key holding the chunk text.
+        """
+        try:
+            vectors = [
+                {
+                    "id": vector_id,
+                    "values": embedding,
+                    "metadata": {
+                        **{key: value for key, value in chunk.metadata.items() if value is not None},
+                        text_key: chunk.page_content,
+                    },
+                }
+                for vector_id, embedding, chunk in zip(ids, embeddings, chunks)
+            ]
+            for start in range(0, len(vectors), batch_size):
+                self.index.upsert(vectors=vectors[start:start + batch_size], namespace=namespace)
+            logger.info("Upserted %d vectors into namespace '%s'.", len(vectors), namespace)
+        except Exception:
+            logger.exception("Failed to upsert shard '%s'.", namespace)
+            raise
+
+
+class ShardWriteError(RuntimeError):
+    """
+    Raised when indexing a shard fails after its Pinecone namespace has started to be modified.
+    """
+
 
 class DataProcessor:
     """
@@ -221,9 +369,11 @@ class DataProcessor:
         Initialize all processing components.
         """
         self.pdf_handler = PDFDocumentHandler()
+        self.directory_handler = PDFDirectoryHandler()
         self.preprocessor = TextPreprocessor()
         self.chunker = DocumentChunker()
         self.vector_store_creator = VectorStoreCreator()
+        self.shard_manifest = ShardManifest()
 
     def process_data(self) -> None:
         """
@@ -255,12 +405,141 @@ class DataProcessor:
             logger.exception("Data processing failed.")
             raise
 
+    def _process_shard(self, namespace: str, relative_paths: list[str]) -> tuple[list[float], int]:
+        """
+        Load, preprocess, chunk and index the PDFs of a single shard into its own namespace.
+        Chunks get deterministic IDs and are upserted over the existing vectors before vectors
+        that are no longer produced are deleted, so the shard is replaced in place and stays
+        searchable while it is re-indexed.
+
+        Args:
+            namespace (str): Pinecone namespace of the shard.
+            relative_paths (list[str]): PDF files of the shard, relative to the corpus directory.
+
+        Returns:
+            tuple[list[float], int]: Routing centroid and number of chunks of the shard.
+
+        Raises:
+            ShardWriteError: If the failure happened after the namespace started to be modified.
+        """
+        documents = []
+        for relative_path in relative_paths:
+            handler = PDFDocumentHandler(os.path.join(self.directory_handler.directory, relative_path))
+            handler.load_documents()
+            for doc in handler.get_documents():
+                doc.metadata["source"] = relative_path
+                documents.append(doc)
+
+        for doc in documents:
+            doc.page_content = self.preprocessor.preprocess_text(doc.page_content)
+            doc.metadata["shard"] = namespace
+
+        chunks = [chunk for chunk in self.chunker.chunk_documents(documents) if chunk.page_content]
+        if not chunks:
+            raise ValueError(f"No text could be extracted for shard '{namespace}'.")
+
+        # Vector IDs derived from (source, page, chunk index within the page).
+        ids = []
+        chunk_counts = {}
+        for chunk in chunks:
+            page_key = (chunk.metadata["source"], chunk.metadata.get("page"))
+            chunk_idx = chunk_counts.get(page_key, 0)
+            chunk_counts[page_key] = chunk_idx + 1
+            ids.append(hashlib.sha1(f"{page_key[0]}:{page_key[1]}:{chunk_idx}".encode("utf-8")).hexdigest())
+
+        embeddings = self.vector_store_creator.embed_chunks(chunks)
+        existing_ids = self.vector_store_creator.list_vector_ids(namespace)
+
+        try:
+            self.vector_store_creator.upsert_shard(chunks, embeddings, ids, namespace)
+            obsolete_ids = sorted(existing_ids - set(ids))
+            if obsolete_ids:
+                self.vector_store_creator.delete_vectors(obsolete_ids, namespace)
+        except Exception as error:
+            raise ShardWriteError(f"Writing shard '{namespace}' to Pinecone failed.") from error
+
+        logger.info("Shard '%s' indexed with %d chunks from %d files.", namespace, len(chunks), len(relative_paths))
+        return compute_centroid(embeddings), len(chunks)
+
+    def process_directory(self) -> None:
+        """
+        Ingest the PDFs of the corpus directory, one shard (Pinecone namespace) per document or group.
+        Only shards whose files were added or changed since the last run (by content hash) are
+        re-indexed, concurrently; the other shards are carried over from the manifest. Namespaces
+        of removed shards are cleared. A failing shard is logged and skipped: its previous
+        manifest entry is kept unless the failure happened while writing to its namespace, in
+        which case the namespace is cleared. The manifest is saved before the error is raised.
+        """
+        try:
+            logger.info("Starting sharded data processing pipeline.")
+            directory = self.directory_handler.directory
+            shards = group_into_shards(self.directory_handler.list_pdf_files(), directory)
+            if not shards:
+                raise ValueError(f"No PDF files found in {directory}.")
+
+            previous_manifest = ShardManifest(self.shard_manifest.path)
+            previous_manifest.load()
+            self.shard_manifest.shards = {}
+            for stale_namespace in sorted(set(previous_manifest.shards) - set(shards)):
+                logger.info("Removing stale shard '%s'.", stale_namespace)
+                self.vector_store_creator.clear_namespace(stale_namespace)
+
+            fingerprints = {
+                namespace: {path: file_fingerprint(os.path.join(directory, path)) for path in relative_paths}
+                for namespace, relative_paths in shards.items()
+            }
+            changed = [
+                namespace for namespace in shards
+                if not previous_manifest.is_current(namespace, fingerprints[namespace])
+            ]
+            for namespace in shards:
+                if namespace not in changed:
+                    self.shard_manifest.shards[namespace] = previous_manifest.shards[namespace]
+            logger.info(
+                "%d of %d shards are up to date; re-indexing %d.",
+                len(shards) - len(changed), len(shards), len(changed)
+            )
+
+            failures = {}
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
+                futures = {
+                    namespace: executor.submit(self._process_shard, namespace, shards[namespace])
+                    for namespace in changed
+                }
+                for namespace, future in futures.items():
+                    try:
+                        centroid, num_chunks = future.result()
+                        self.shard_manifest.add_shard(namespace, fingerprints[namespace], centroid, num_chunks)
+                    except ShardWriteError as error:
+                        # The namespace holds a mix of old and new vectors: remove it until the next run.
+                        logger.exception("Skipping shard '%s' (%s).", namespace, shards[namespace])
+                        failures[namespace] = error
+                        try:
+                            self.vector_store_creator.clear_namespace(namespace)
+                        except Exception:
+                            logger.exception("Could not clear failed shard '%s'.", namespace)
+                    except Exception as error:
+                        # The namespace was not modified, so its previous version stays searchable.
+                        logger.exception("Skipping shard '%s' (%s).", namespace, shards[namespace])
+                        failures[namespace] = error
+                        if namespace in previous_manifest.shards:
+                            self.shard_manifest.shards[namespace] = previous_manifest.shards[namespace]
+
+            self.shard_manifest.save()
+            if failures:
+                raise RuntimeError(
+                    f"{len(failures)} of {len(shards)} shards failed to process: {', '.join(sorted(failures))}"
+                )
+            logger.info("Sharded data processing completed successfully. %d shards are ready.", len(shards))
+        except Exception:
+            logger.exception("Sharded data processing failed.")
+            raise
 
 if __name__ == "__main__":
     try:
         logger.info("Running data_processor module as standalone script.")
         processor = DataProcessor()
-        processor.process_data()
+        processor.process_directory()
     except Exception:
         logger.exception("Error occurred in data_processor module.")
         raise
\ No newline at end of file
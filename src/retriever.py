@@ -1,9 +1,61 @@
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
 from langchain_pinecone import PineconeVectorStore
 from langchain_huggingface import HuggingFaceEmbeddings
 from src.config import *
+from src.sharding import ShardManifest, ShardRouter, fan_out_search
 from src import logger
 from pinecone import Pinecone
 
+# Shared by all ShardedRetriever instances (e.g. one per chat session), so idle threads do not pile up.
+_SHARD_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS, thread_name_prefix="shard-search")
+
+
+class ShardedRetriever(BaseRetriever):
+    """
+    Retriever that queries only the shards selected by the router, fans out to them
+    concurrently and merges the hits by similarity score.
+    """
+
+    vector_store: Any
+    router: Any
+    k: int = Top_K
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        """
+        Retrieve the top-k documents for a query across the routed shards.
+
+        Args:
+            query (str): The user query.
+            run_manager (CallbackManagerForRetrieverRun): LangChain callback manager.
+
+        Returns:
+            list[Document]: Merged documents, best first.
+        """
+        try:
+            # Embed the query once and reuse the vector for routing and every shard search.
+            query_embedding = self.vector_store.embeddings.embed_query(query)
+            namespaces = self.router.route(query_embedding)
+            logger.info("Routing query to shards: %s", namespaces)
+            hits = fan_out_search(
+                lambda namespace: self.vector_store.similarity_search_by_vector_with_score(
+                    query_embedding, k=self.k, namespace=namespace
+                ),
+                namespaces,
+                k=self.k,
+                executor=_SHARD_SEARCH_EXECUTOR,
+            )
+            return [doc for doc, _ in hits]
+        except Exception:
+            logger.exception("Failed to retrieve documents from shards.")
+            raise
+
+
 class VectorStoreRetriever:
     """
     Loads a Pinecone vector store and provides an interface for retrieving documents.
@@ -35,6 +87,7 @@ class VectorStoreRetriever:
     def retrieve_documents(self) -> object:
         """
         Create retrieval interface with proper search configurations.
+        If a shard manifest exists, a ShardedRetriever routing over the shard namespaces is returned.
 
         Returns:
             object: Configured retriver Interface
@@ -42,6 +95,14 @@ class VectorStoreRetriever:
         try:
             if self.vector_store is None:
                 raise ValueError("Vector store not loaded. Call load_vector_store() first.")
+            shard_manifest = ShardManifest()
+            if shard_manifest.load() and shard_manifest.shards:
+                retriever_interface = ShardedRetriever(
+                    vector_store=self.vector_store,
+                    router=ShardRouter(shard_manifest),
+                )
+                logger.info("Sharded retrieval interface created over %d shards.", len(shard_manifest.shards))
+                return retriever_interface
             retriever_interface = self.vector_store.as_retriever(
                 search_type=PINECONE_SEARCH_TYPE,
                 search_kwargs={
@@ -0,0 +1,252 @@
+import os
+import re
+import json
+import heapq
+import hashlib
+from concurrent.futures import Executor
+from typing import Callable
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config import (
+    PDF_DIRECTORY,
+    SHARD_MANIFEST_PATH,
+    SHARD_BY_SUBDIRECTORY,
+    ROUTER_TOP_SHARDS,
+)
+from src import logger
+
+
+def shard_namespace(shard_key: str) -> str:
+    """
+    Derive a stable Pinecone namespace from a shard key (a path relative to the corpus directory).
+    A readable slug is combined with a hash of the key, so distinct keys never share a namespace.
+
+    Args:
+        shard_key (str): Relative path of the document or subdirectory forming the shard.
+
+    Returns:
+        str: Namespace name.
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', os.path.splitext(shard_key)[0].lower()).strip('-')[:40] or "shard"
+    digest = hashlib.sha1(shard_key.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+def group_into_shards(
+    pdf_paths: list[str],
+    base_dir: str = PDF_DIRECTORY,
+    group_by_subdirectory: bool = SHARD_BY_SUBDIRECTORY,
+) -> dict[str, list[str]]:
+    """
+    Assign PDF files to shards. Each shard maps to one Pinecone namespace.
+    Files directly in base_dir get a shard of their own; with group_by_subdirectory, all files
+    below the same top-level subdirectory share one shard. Shard names only depend on the
+    relative path, so adding or removing other files never moves a document to another shard.
+
+    Args:
+        pdf_paths (list[str]): Paths of the PDF files to ingest.
+        base_dir (str): Corpus directory the paths are relative to.
+        group_by_subdirectory (bool): Group files by their top-level subdirectory.
+
+    Returns:
+        dict[str, list[str]]: Namespace name mapped to the relative paths of the files it holds.
+    """
+    shards = {}
+    shard_keys = {}
+    for pdf_path in sorted(pdf_paths):
+        relative_path = os.path.relpath(pdf_path, base_dir).replace(os.sep, "/")
+        parts = relative_path.split("/")
+        shard_key = parts[0] if group_by_subdirectory and len(parts) > 1 else relative_path
+        namespace = shard_namespace(shard_key)
+        if shard_keys.setdefault(namespace, shard_key) != shard_key:
+            raise ValueError(
+                f"Shard namespace collision: '{shard_key}' and '{shard_keys[namespace]}' both map to '{namespace}'."
+            )
+        shards.setdefault(namespace, []).append(relative_path)
+    return shards
+
+
+def file_fingerprint(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute a SHA-1 content hash of a file, used to detect added or changed documents.
+
+    Args:
+        path (str): Path of the file.
+        block_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compute_centroid(embeddings: list[list[float]]) -> list[float]:
+    """
+    Compute the unit-length mean of a set of embeddings, used as the routing signature of a shard.
+
+    Args:
+        embeddings (list[list[float]]): Embeddings of the shard's chunks.
+
+    Returns:
+        list[float]: Normalized centroid vector.
+    """
+    matrix = np.array(embeddings, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    centroid = matrix.mean(axis=0)
+    centroid /= np.linalg.norm(centroid) + 1e-12
+    return centroid.tolist()
+
+
+class ShardManifest:
+    """
+    Persists the list of shards, the fingerprints of their source files and routing centroids as a JSON file.
+    """
+
+    def __init__(self, path: str = SHARD_MANIFEST_PATH) -> None:
+        """
+        Initialize with the path of the manifest file.
+
+        Args:
+            path (str): Location of the JSON manifest.
+        """
+        self.path = path
+        self.shards: dict[str, dict] = {}
+
+    def add_shard(
+        self,
+        namespace: str,
+        fingerprints: dict[str, str],
+        centroid: list[float],
+        num_chunks: int,
+    ) -> None:
+        """
+        Register (or replace) a shard in the manifest.
+
+        Args:
+            namespace (str): Pinecone namespace holding the shard.
+            fingerprints (dict[str, str]): Relative path of each file in the shard mapped to its content hash.
+            centroid (list[float]): Routing centroid of the shard.
+            num_chunks (int): Number of chunks stored in the shard.
+        """
+        self.shards[namespace] = {
+            "sources": dict(fingerprints),
+            "centroid": centroid,
+            "num_chunks": num_chunks,
+        }
+
+    def is_current(self, namespace: str, fingerprints: dict[str, str]) -> bool:
+        """
+        Check whether a shard was indexed from exactly the given files and contents.
+
+        Args:
+            namespace (str): Pinecone namespace of the shard.
+            fingerprints (dict[str, str]): Relative path of each file in the shard mapped to its content hash.
+
+        Returns:
+            bool: True if the shard does not need to be re-indexed.
+        """
+        shard = self.shards.get(namespace)
+        return shard is not None and shard.get("sources") == fingerprints
+
+    def load(self) -> bool:
+        """
+        Load the manifest from disk.
+
+        Returns:
+            bool: True if a manifest was found, False otherwise.
+        """
+        if not os.path.exists(self.path):
+            logger.info("No shard manifest found at %s.", self.path)
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.shards = json.load(f)
+            logger.info("Loaded shard manifest with %d shards.", len(self.shards))
+            return True
+        except Exception:
+            logger.exception("Failed to load shard manifest.")
+            raise
+
+    def save(self) -> None:
+        """
+        Write the manifest to disk.
+        """
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.shards, f)
+            logger.info("Saved shard manifest with %d shards to %s.", len(self.shards), self.path)
+        except Exception:
+            logger.exception("Failed to save shard manifest.")
+            raise
+
+
+class ShardRouter:
+    """
+    Selects the shards most relevant to a query by comparing its embedding with the shard centroids.
+    """
+
+    def __init__(self, manifest: ShardManifest, top_shards: int = ROUTER_TOP_SHARDS) -> None:
+        """
+        Initialize the router from a loaded manifest.
+
+        Args:
+            manifest (ShardManifest): Manifest providing the shard centroids.
+            top_shards (int): Number of shards to select per query.
+        """
+        self.top_shards = top_shards
+        self.namespaces = list(manifest.shards)
+        if self.namespaces:
+            self.centroids = np.asarray(
+                [manifest.shards[name]["centroid"] for name in self.namespaces], dtype=np.float32
+            )
+        else:
+            self.centroids = np.empty((0, 0), dtype=np.float32)
+
+    def route(self, query_embedding: list[float]) -> list[str]:
+        """
+        Return the namespaces of the shards closest to the query, best first.
+
+        Args:
+            query_embedding (list[float]): Embedding of the user query.
+
+        Returns:
+            list[str]: Selected namespaces.
+        """
+        if not self.namespaces or self.top_shards < 1:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        scores = self.centroids @ (query / (np.linalg.norm(query) + 1e-12))
+        top_shards = min(self.top_shards, len(self.namespaces))
+        top = np.argpartition(-scores, top_shards - 1)[:top_shards]
+        top = top[np.argsort(-scores[top])]
+        return [self.namespaces[i] for i in top]
+
+
+def fan_out_search(
+    search_fn: Callable[[str], list[tuple[Document, float]]],
+    namespaces: list[str],
+    k: int,
+    executor: Executor,
+) -> list[tuple[Document, float]]:
+    """
+    Query several shards concurrently and merge their hits by score (higher is better).
+
+    Args:
+        search_fn (Callable): Searches a single namespace and returns (Document, score) pairs.
+        namespaces (list[str]): Namespaces to query.
+        k (int): Number of merged results to return.
+        executor (Executor): Long-lived executor running the shard queries concurrently.
+
+    Returns:
+        list[tuple[Document, float]]: The k best hits across all queried shards.
+    """
+    if not namespaces:
+        return []
+    per_shard = list(executor.map(search_fn, namespaces))
+    return heapq.nlargest(k, (hit for hits in per_shard for hit in hits), key=lambda hit: hit[1])
@@ -0,0 +1,79 @@
+import hashlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+class FakeIndex:
+    """
+    In-memory stand-in for a Pinecone index, covering the calls made by the pipeline.
+    """
+
+    def __init__(self) -> None:
+        self.config = SimpleNamespace(host="fake-host", api_key="fake-key")
+        self.namespaces: dict[str, dict[str, dict]] = {}
+        self.fail_upsert_namespaces: set[str] = set()
+
+    def upsert(self, vectors: list[dict], namespace: str) -> None:
+        if namespace in self.fail_upsert_namespaces:
+            raise ConnectionError("upsert failed")
+        store = self.namespaces.setdefault(namespace, {})
+        for vector in vectors:
+            store[vector["id"]] = {"values": vector["values"], "metadata": dict(vector["metadata"])}
+
+    def delete(self, ids=None, delete_all=None, namespace=None, **kwargs) -> None:
+        if delete_all:
+            self.namespaces.pop(namespace, None)
+            return
+        store = self.namespaces.get(namespace, {})
+        for vector_id in ids:
+            store.pop(vector_id, None)
+
+    def list(self, namespace=None, **kwargs):
+        ids = sorted(self.namespaces.get(namespace, {}))
+        for start in range(0, len(ids), 2):
+            yield ids[start:start + 2]
+
+    def describe_index_stats(self):
+        return SimpleNamespace(namespaces={name: {} for name, store in self.namespaces.items() if store})
+
+    def query(self, vector, top_k, include_metadata=True, namespace=None, filter=None):
+        matches = [
+            {"id": vector_id, "score": float(np.dot(vector, entry["values"])), "metadata": dict(entry["metadata"])}
+            for vector_id, entry in self.namespaces.get(namespace, {}).items()
+        ]
+        matches.sort(key=lambda match: match["score"], reverse=True)
+        return {"matches": matches[:top_k]}
+
+
+class FakeEmbeddings:
+    """
+    Deterministic embeddings derived from a hash of the text.
+    """
+
+    def __init__(self) -> None:
+        self.query_calls: list[str] = []
+
+    @staticmethod
+    def _embed(text: str) -> list[float]:
+        seed = int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).standard_normal(8)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.query_calls.append(text)
+        return self._embed(text)
+
+
+@pytest.fixture
+def fake_index() -> FakeIndex:
+    return FakeIndex()
+
+
+@pytest.fixture
+def fake_embeddings() -> FakeEmbeddings:
+    return FakeEmbeddings()
@@ -0,0 +1,189 @@
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+from langchain_pinecone import PineconeVectorStore
+
+from src import data_processor
+from src.data_processor import DataProcessor, PDFDirectoryHandler, VectorStoreCreator
+from src.sharding import ShardManifest, shard_namespace
+
+
+def make_creator(index, embeddings) -> VectorStoreCreator:
+    creator = VectorStoreCreator.__new__(VectorStoreCreator)
+    creator.index = index
+    creator.embedding_model = embeddings
+    return creator
+
+
+@pytest.fixture
+def pipeline(tmp_path, fake_index, fake_embeddings, monkeypatch):
+    loaded = []
+
+    class FakePDFLoader:
+        """Reads a text file whose pages are separated by form feeds."""
+
+        def __init__(self, path: str) -> None:
+            self.path = path
+
+        def load(self) -> list[Document]:
+            loaded.append(self.path)
+            with open(self.path, encoding="utf-8") as f:
+                text = f.read()
+            if text.startswith("BROKEN"):
+                raise ValueError("unreadable PDF")
+            return [
+                Document(page_content=page, metadata={"source": self.path, "page": number, "author": None})
+                for number, page in enumerate(text.split("\f"))
+            ]
+
+    monkeypatch.setattr(data_processor, "PDFPlumberLoader", FakePDFLoader)
+    monkeypatch.setattr(data_processor, "VectorStoreCreator", lambda: make_creator(fake_index, fake_embeddings))
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    processor = DataProcessor()
+    processor.directory_handler = PDFDirectoryHandler(str(corpus))
+    processor.shard_manifest = ShardManifest(str(tmp_path / "shard_manifest.json"))
+    return SimpleNamespace(processor=processor, corpus=corpus, index=fake_index, loaded=loaded)
+
+
+def write_pdf(pipeline, name: str, *pages: str) -> None:
+    (pipeline.corpus / name).write_text("\f".join(pages), encoding="utf-8")
+
+
+def saved_manifest(pipeline) -> dict:
+    manifest = ShardManifest(pipeline.processor.shard_manifest.path)
+    manifest.load()
+    return manifest.shards
+
+
+def test_process_directory_indexes_each_file_into_its_own_namespace(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one", "alpha two")
+    write_pdf(pipeline, "b.pdf", "beta one")
+
+    pipeline.processor.process_directory()
+
+    shards = saved_manifest(pipeline)
+    namespace_a, namespace_b = shard_namespace("a.pdf"), shard_namespace("b.pdf")
+    assert set(shards) == {namespace_a, namespace_b}
+    assert list(shards[namespace_a]["sources"]) == ["a.pdf"]
+    assert shards[namespace_a]["num_chunks"] == len(pipeline.index.namespaces[namespace_a]) == 2
+    assert len(pipeline.index.namespaces[namespace_b]) == 1
+
+
+def test_rerun_without_changes_reindexes_nothing(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one", "alpha two")
+    pipeline.processor.process_directory()
+    vectors = {name: dict(store) for name, store in pipeline.index.namespaces.items()}
+    pipeline.loaded.clear()
+
+    pipeline.processor.process_directory()
+
+    assert pipeline.loaded == []
+    assert pipeline.index.namespaces == vectors
+
+
+def test_vector_ids_are_stable_across_reruns(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one", "alpha two")
+    pipeline.processor.process_directory()
+    namespace = shard_namespace("a.pdf")
+    ids = set(pipeline.index.namespaces[namespace])
+
+    # Without a manifest every shard is re-indexed; the same chunks must map to the same IDs.
+    (pipeline.corpus.parent / "shard_manifest.json").unlink()
+    pipeline.processor.process_directory()
+
+    assert set(pipeline.index.namespaces[namespace]) == ids
+
+
+def test_changed_file_is_replaced_in_place(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one", "alpha two", "alpha three")
+    write_pdf(pipeline, "b.pdf", "beta one")
+    pipeline.processor.process_directory()
+    namespace = shard_namespace("a.pdf")
+    old_ids = set(pipeline.index.namespaces[namespace])
+    pipeline.loaded.clear()
+
+    write_pdf(pipeline, "a.pdf", "alpha one", "alpha two revised")
+    pipeline.processor.process_directory()
+
+    stored = pipeline.index.namespaces[namespace]
+    assert [path.rsplit("/", 1)[-1] for path in pipeline.loaded] == ["a.pdf"]
+    assert len(stored) == 2 == saved_manifest(pipeline)[namespace]["num_chunks"]
+    assert set(stored) < old_ids
+    assert sorted(entry["metadata"]["text"] for entry in stored.values()) == ["alpha one", "alpha two revised"]
+
+
+def test_removed_file_clears_its_namespace(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one")
+    write_pdf(pipeline, "b.pdf", "beta one")
+    pipeline.processor.process_directory()
+
+    (pipeline.corpus / "b.pdf").unlink()
+    pipeline.processor.process_directory()
+
+    assert shard_namespace("b.pdf") not in pipeline.index.namespaces
+    assert set(saved_manifest(pipeline)) == {shard_namespace("a.pdf")}
+
+
+def test_failure_before_writing_keeps_previous_shard(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one")
+    write_pdf(pipeline, "b.pdf", "beta one")
+    pipeline.processor.process_directory()
+    namespace = shard_namespace("a.pdf")
+    previous_entry = saved_manifest(pipeline)[namespace]
+    previous_vectors = dict(pipeline.index.namespaces[namespace])
+
+    write_pdf(pipeline, "a.pdf", "BROKEN")
+    write_pdf(pipeline, "b.pdf", "beta one revised")
+    with pytest.raises(RuntimeError, match="1 of 2 shards"):
+        pipeline.processor.process_directory()
+
+    shards = saved_manifest(pipeline)
+    assert shards[namespace] == previous_entry
+    assert pipeline.index.namespaces[namespace] == previous_vectors
+    assert shards[shard_namespace("b.pdf")]["sources"] != previous_entry["sources"]
+
+
+def test_failure_while_writing_clears_shard(pipeline):
+    write_pdf(pipeline, "a.pdf", "alpha one")
+    write_pdf(pipeline, "b.pdf", "beta one")
+    pipeline.processor.process_directory()
+    namespace = shard_namespace("a.pdf")
+
+    write_pdf(pipeline, "a.pdf", "alpha one revised")
+    pipeline.index.fail_upsert_namespaces.add(namespace)
+    with pytest.raises(RuntimeError, match="1 of 2 shards"):
+        pipeline.processor.process_directory()
+
+    assert namespace not in pipeline.index.namespaces
+    assert set(saved_manifest(pipeline)) == {shard_namespace("b.pdf")}
+
+
+def test_failing_new_shard_does_not_prevent_saving_the_others(pipeline):
+    write_pdf(pipeline, "a.pdf", "")
+    write_pdf(pipeline, "b.pdf", "beta one")
+
+    with pytest.raises(RuntimeError, match="1 of 2 shards"):
+        pipeline.processor.process_directory()
+
+    assert set(saved_manifest(pipeline)) == {shard_namespace("b.pdf")}
+    assert shard_namespace("a.pdf") not in pipeline.index.namespaces
+
+
+def test_upsert_shard_layout_is_readable_by_pinecone_vector_store(fake_index, fake_embeddings):
+    creator = make_creator(fake_index, fake_embeddings)
+    chunks = [
+        Document(page_content="alpha", metadata={"source": "a.pdf", "page": 0, "author": None}),
+        Document(page_content="beta", metadata={"source": "a.pdf", "page": 1}),
+    ]
+    embeddings = creator.embed_chunks(chunks)
+
+    creator.upsert_shard(chunks, embeddings, ["id-0", "id-1"], "ns")
+
+    vector_store = PineconeVectorStore(index=fake_index, embedding=fake_embeddings)
+    [(document, score)] = vector_store.similarity_search_by_vector_with_score(embeddings[0], k=1, namespace="ns")
+    assert document.page_content == "alpha"
+    assert document.metadata == {"source": "a.pdf", "page": 0}
+    assert score == pytest.approx(1.0)
@@ -0,0 +1,75 @@
+from langchain_pinecone import PineconeVectorStore
+
+from src import retriever
+from src.retriever import ShardedRetriever
+
+
+class RecordingRouter:
+    """Routes every query to fixed namespaces and records the embeddings it receives."""
+
+    def __init__(self, namespaces: list[str]) -> None:
+        self.namespaces = namespaces
+        self.embeddings = []
+
+    def route(self, query_embedding: list[float]) -> list[str]:
+        self.embeddings.append(query_embedding)
+        return list(self.namespaces)
+
+
+class RecordingVectorStore:
+    """Wraps a vector store and records the namespace of every search."""
+
+    def __init__(self, vector_store: PineconeVectorStore) -> None:
+        self.vector_store = vector_store
+        self.embeddings = vector_store.embeddings
+        self.searches = []
+
+    def similarity_search_by_vector_with_score(self, embedding, k, namespace):
+        self.searches.append((tuple(embedding), namespace))
+        return self.vector_store.similarity_search_by_vector_with_score(embedding, k=k, namespace=namespace)
+
+
+def index_texts(index, embeddings, namespace: str, texts: list[str]) -> None:
+    index.upsert(
+        vectors=[
+            {"id": f"{namespace}-{i}", "values": vector, "metadata": {"text": text, "shard": namespace}}
+            for i, (text, vector) in enumerate(zip(texts, embeddings.embed_documents(texts)))
+        ],
+        namespace=namespace,
+    )
+
+
+def test_sharded_retriever_embeds_once_and_searches_each_routed_namespace(fake_index, fake_embeddings):
+    index_texts(fake_index, fake_embeddings, "a", ["what is cancer", "alpha filler"])
+    index_texts(fake_index, fake_embeddings, "b", ["beta filler"])
+    index_texts(fake_index, fake_embeddings, "c", ["never searched"])
+    vector_store = RecordingVectorStore(PineconeVectorStore(index=fake_index, embedding=fake_embeddings))
+    router = RecordingRouter(["a", "b"])
+
+    documents = ShardedRetriever(vector_store=vector_store, router=router, k=2).invoke("what is cancer")
+
+    query_embedding = tuple(fake_embeddings.embed_query("what is cancer"))
+    assert fake_embeddings.query_calls == ["what is cancer"] * 2  # retriever call + the check above
+    assert [tuple(embedding) for embedding in router.embeddings] == [query_embedding]
+    assert sorted(vector_store.searches) == [(query_embedding, "a"), (query_embedding, "b")]
+    assert len(documents) == 2
+    assert documents[0].page_content == "what is cancer"
+    assert {document.metadata["shard"] for document in documents} <= {"a", "b"}
+
+
+def test_sharded_retrievers_share_one_executor(fake_index, fake_embeddings, monkeypatch):
+    used_executors = []
+    original_fan_out_search = retriever.fan_out_search
+
+    def recording_fan_out_search(search_fn, namespaces, k, executor):
+        used_executors.append(executor)
+        return original_fan_out_search(search_fn, namespaces, k, executor)
+
+    monkeypatch.setattr(retriever, "fan_out_search", recording_fan_out_search)
+    vector_store = PineconeVectorStore(index=fake_index, embedding=fake_embeddings)
+
+    for _ in range(3):
+        ShardedRetriever(vector_store=vector_store, router=RecordingRouter([])).invoke("query")
+
+    assert len(used_executors) == 3
+    assert all(executor is used_executors[0] for executor in used_executors)
@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src import sharding
+from src.sharding import (
+    ShardManifest,
+    ShardRouter,
+    compute_centroid,
+    fan_out_search,
+    file_fingerprint,
+    group_into_shards,
+    shard_namespace,
+)
+
+BASE_DIR = os.path.join(os.sep, "corpus")
+
+
+def corpus_path(*parts: str) -> str:
+    return os.path.join(BASE_DIR, *parts)
+
+
+def test_group_into_shards_one_shard_per_top_level_file():
+    shards = group_into_shards([corpus_path("b.pdf"), corpus_path("a.pdf")], BASE_DIR)
+
+    assert shards == {shard_namespace("a.pdf"): ["a.pdf"], shard_namespace("b.pdf"): ["b.pdf"]}
+
+
+def test_group_into_shards_groups_by_subdirectory():
+    paths = [corpus_path("trials", "x.pdf"), corpus_path("trials", "nested", "y.pdf"), corpus_path("z.pdf")]
+
+    shards = group_into_shards(paths, BASE_DIR, group_by_subdirectory=True)
+
+    assert shards[shard_namespace("trials")] == ["trials/nested/y.pdf", "trials/x.pdf"]
+    assert shards[shard_namespace("z.pdf")] == ["z.pdf"]
+
+
+def test_group_into_shards_without_subdirectory_grouping_keeps_files_apart():
+    paths = [corpus_path("trials", "x.pdf"), corpus_path("other", "x.pdf")]
+
+    shards = group_into_shards(paths, BASE_DIR, group_by_subdirectory=False)
+
+    assert sorted(shards.values()) == [["other/x.pdf"], ["trials/x.pdf"]]
+
+
+def test_group_into_shards_names_are_stable_when_files_are_added():
+    before = group_into_shards([corpus_path("b.pdf")], BASE_DIR)
+    after = group_into_shards([corpus_path("a.pdf"), corpus_path("b.pdf")], BASE_DIR)
+
+    assert set(before) <= set(after)
+    assert after[next(iter(before))] == ["b.pdf"]
+
+
+def test_shard_namespace_distinguishes_keys_with_the_same_slug():
+    assert shard_namespace("Foo Bar.pdf") != shard_namespace("foo-bar.pdf")
+    assert shard_namespace("Foo Bar.pdf").startswith("foo-bar-")
+
+
+def test_group_into_shards_raises_on_namespace_collision(monkeypatch):
+    monkeypatch.setattr(sharding, "shard_namespace", lambda shard_key: "same")
+
+    with pytest.raises(ValueError, match="collision"):
+        group_into_shards([corpus_path("a.pdf"), corpus_path("b.pdf")], BASE_DIR)
+
+
+def test_compute_centroid_is_normalized_and_does_not_modify_input():
+    embeddings = np.array([[3.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+    original = embeddings.copy()
+
+    centroid = compute_centroid(embeddings)
+
+    np.testing.assert_allclose(centroid, [np.sqrt(0.5), np.sqrt(0.5)], rtol=1e-5)
+    np.testing.assert_array_equal(embeddings, original)
+
+
+def test_file_fingerprint_changes_with_content(tmp_path):
+    path = tmp_path / "a.pdf"
+    path.write_bytes(b"first")
+    first = file_fingerprint(str(path))
+
+    assert file_fingerprint(str(path)) == first
+    path.write_bytes(b"second")
+    assert file_fingerprint(str(path)) != first
+
+
+def make_manifest(path: str = "") -> ShardManifest:
+    manifest = ShardManifest(path=path)
+    manifest.add_shard("x", {"x.pdf": "hash-x"}, [1.0, 0.0], 3)
+    manifest.add_shard("y", {"y.pdf": "hash-y"}, [0.0, 1.0], 4)
+    manifest.add_shard("z", {"z.pdf": "hash-z"}, [np.sqrt(0.5), np.sqrt(0.5)], 5)
+    return manifest
+
+
+def test_router_returns_closest_shards_best_first():
+    router = ShardRouter(make_manifest(), top_shards=2)
+
+    assert router.route([0.1, 1.0]) == ["y", "z"]
+    assert router.route([1.0, 0.2]) == ["x", "z"]
+
+
+def test_router_with_fewer_shards_than_top_shards_returns_all_ordered():
+    router = ShardRouter(make_manifest(), top_shards=5)
+
+    assert router.route([0.0, 1.0]) == ["y", "z", "x"]
+
+
+def test_router_without_shards_returns_nothing():
+    assert ShardRouter(ShardManifest(path=""), top_shards=3).route([1.0, 0.0]) == []
+
+
+def test_fan_out_search_merges_hits_by_score():
+    hits = {
+        "x": [(Document(page_content="x1"), 0.9), (Document(page_content="x2"), 0.1)],
+        "y": [(Document(page_content="y1"), 0.5)],
+        "z": [(Document(page_content="z1"), 0.7)],
+    }
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        merged = fan_out_search(hits.__getitem__, ["x", "y", "z"], k=3, executor=executor)
+        empty = fan_out_search(hits.__getitem__, [], k=3, executor=executor)
+
+    assert [(doc.page_content, score) for doc, score in merged] == [("x1", 0.9), ("z1", 0.7), ("y1", 0.5)]
+    assert empty == []
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / "shard_manifest.json")
+    make_manifest(path).save()
+
+    loaded = ShardManifest(path=path)
+
+    assert loaded.load()
+    assert loaded.shards == make_manifest().shards
+
+
+def test_manifest_is_current_compares_fingerprints():
+    manifest = make_manifest()
+
+    assert manifest.is_current("x", {"x.pdf": "hash-x"})
+    assert not manifest.is_current("x", {"x.pdf": "changed"})
+    assert not manifest.is_current("x", {"x.pdf": "hash-x", "new.pdf": "hash-new"})
+    assert not manifest.is_current("missing", {"x.pdf": "hash-x"})
+
+
+def test_manifest_load_missing_file(tmp_path):
+    assert not ShardManifest(path=str(tmp_path / "missing.json")).load()